@@ -10,10 +10,10 @@
 # Import essential functions and classes from submodules
 from .utils import *
 from .process_futures import *
-from .topic_model_trainer import train_model_v2
+from .topic_model_trainer import train_model_v2, UNIFIED_DICTIONARY_DATASET
 from .alpha_eta import calculate_numeric_alpha, calculate_numeric_beta, validate_alpha_beta, calculate_alpha_beta
 from .visualization import create_vis_pylda, create_vis_pcoa, process_visualizations, create_vis_pca, create_tsne_plot, get_document_topics
-from .write_to_postgres import save_to_zip, create_dynamic_table_class, create_table_if_not_exists, add_model_data_to_database
+from .write_to_postgres import save_to_zip, create_dynamic_table_class, create_table_if_not_exists, add_model_data_to_database, prepare_model_data_row, copy_model_data_to_database, MODEL_DATA_COLUMNS
 from .yaml_loader import join, getenv, get_current_time
 from .postgres_logging  import  PostgresLoggingHandler
 from .mathstats import *
@@ -37,6 +37,10 @@ __all__ = [
     'cpu_simulate_coherence_scores_with_lln',
     'gpu_simulate_coherence_scores_with_lln',
     'simulate_coherence_scores_with_lln_optimized',
+    'sum_counts',
+    'corpus_word_count',
+    'corpus_size',
+    'as_gensim_corpus',
 
     # batch estimation
     'estimate_batches_large_docs',
@@ -50,12 +54,19 @@ __all__ = [
     'exponential_backoff',
     'convert_float32_to_float',
     'json_fallback_handler',
+    'to_jsonable',
+    'serialize_to_jsonb',
+    'flatten_documents',
+    'zpack',
+    'zunpack',
+    'zpack_to_pickle',
     'get_file_size',
     'download_from_url',
     'process_local_file',
     'clear_temp_files',
     'periodic_cleanup',
     'safe_serialize_for_postgres',
+    'is_cupy_array',
 
 
     #yaml_loader
@@ -65,6 +76,7 @@ __all__ = [
 
     #topic_model_trainer
     'train_model_v2',
+    'UNIFIED_DICTIONARY_DATASET',
 
     # alpha_eta
     'calculate_numeric_alpha',
@@ -88,12 +100,16 @@ __all__ = [
     'futures_create_lda_datasets_v3',
     'get_and_process_show_topics',
     'extract_topics_with_get_topic_terms',
+    'get_top_topic_words',
 
     # writeToPostgres
     'save_to_zip', 
     'create_dynamic_table_class',
     'create_table_if_not_exists', 
     'add_model_data_to_database',
+    'prepare_model_data_row',
+    'copy_model_data_to_database',
+    'MODEL_DATA_COLUMNS',
     
     #postgres_logging
     'PostgresLoggingHandler'
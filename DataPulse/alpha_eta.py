@@ -19,8 +19,11 @@
 
 import logging 
 from decimal import Decimal
+from functools import lru_cache
 import numpy as np
 
+# Cached: the grid search calls these with the same (value, num_topics) pairs on every batch
+@lru_cache(maxsize=1024)
 def calculate_numeric_alpha(alpha_str, num_topics):
     if alpha_str == 'symmetric':
         return Decimal('1.0') / num_topics
@@ -30,6 +33,7 @@ def calculate_numeric_alpha(alpha_str, num_topics):
         # Use Decimal for arbitrary precision
         return Decimal(alpha_str)
 
+@lru_cache(maxsize=1024)
 def calculate_numeric_beta(beta_str, num_topics):
     if beta_str == 'symmetric':
         return Decimal('1.0') / num_topics
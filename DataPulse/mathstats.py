@@ -49,6 +49,9 @@ from decimal import Decimal, InvalidOperation
 from scipy.stats import gaussian_kde
 import random
 from scipy import stats
+import scipy.sparse as sp
+from gensim.matutils import Sparse2Corpus
+from numba import njit
 from .batch_estimation import estimate_batches_large_docs_v2
 
 
@@ -335,6 +338,45 @@ def calculate_statistics(coherence_scores):
     return mean_coherence, median_coherence, mode_coherence
 
 
+# Sum BoW counts in a compiled loop. Serial on purpose: several Dask worker threads call this at once,
+# and Numba's fallback workqueue threading layer aborts on concurrent parallel launches
+@njit(cache=True)
+def sum_counts(counts):
+    total = 0
+    for i in range(counts.size):
+        total += counts[i]
+    return total
+
+
+def corpus_word_count(corpus):
+    """
+    Total number of words in a BoW corpus, given as a document-by-term sparse matrix or a
+    Gensim list of (id, count) lists. List counts are flattened into one contiguous int64
+    array and summed by the compiled sum_counts kernel.
+    """
+    if sp.issparse(corpus):
+        return int(sum_counts(corpus.data))
+    counts = np.fromiter((cnt for doc in corpus for _, cnt in doc), dtype=np.int64)
+    return int(sum_counts(counts))
+
+
+def corpus_size(corpus):
+    """
+    Number of documents in a BoW corpus given as a document-by-term sparse matrix or a list.
+    """
+    return corpus.shape[0] if sp.issparse(corpus) else len(corpus)
+
+
+def as_gensim_corpus(corpus):
+    """
+    Wrap a document-by-term sparse matrix so Gensim can stream it as a corpus.
+    Gensim-style BoW lists are returned unchanged.
+    """
+    if sp.issparse(corpus):
+        return Sparse2Corpus(corpus, documents_columns=False)
+    return corpus
+
+
 def calculate_value(cv1, cv2):
     """
     Calculate the cosine similarity between two vectors using CuPy for GPU acceleration,
@@ -757,17 +799,17 @@ def calculate_perplexity(negative_log_likelihood, num_words, default_value):
 
 # Calculate perplexity-based threshold
 def calculate_perplexity_threshold(ldamodel, documents, default_score):
-    if not documents:  # Check if documents list is empty
+    if corpus_size(documents) == 0:  # Check if documents list is empty
         logging.warning("[calculate_perplexity_threshold] Empty document list. Returning default threshold.")
         return default_score  # Return a default score if there are no documents
     with np.errstate(divide='ignore', invalid='ignore'):
         # Get the negative log-likelihood
-        negative_log_likelihood = ldamodel.log_perplexity(documents)
+        negative_log_likelihood = ldamodel.log_perplexity(as_gensim_corpus(documents))
         logging.debug(f"[calculate_perplexity_threshold] Negative Log-Likelihood (NLL): {negative_log_likelihood}")
         
     try:
         # Calculate perplexity directly
-        num_words = sum(cnt for doc in documents for _, cnt in doc)
+        num_words = corpus_word_count(documents)
         if num_words == 0:
             logging.warning("[calculate_perplexity_threshold] Corpus contains zero words. Returning default threshold.")
             return default_score
@@ -828,7 +870,7 @@ def compute_full_coherence_score(ldamodel, dictionary, texts, cores):
 @delayed
 def calculate_convergence(ldamodel, phase_corpus, default_score):
     try:
-        return ldamodel.bound(phase_corpus)
+        return ldamodel.bound(as_gensim_corpus(phase_corpus))
     except Exception as e:
         logging.error(f"Issue calculating convergence score: {e}. Value '{default_score}' assigned.")
         return default_score
@@ -840,7 +882,7 @@ def calculate_perplexity_score(ldamodel, phase_corpus, default_score=0.25):
 
     Parameters:
     - ldamodel: The trained LDA model.
-    - phase_corpus: The corpus for the current phase.
+    - phase_corpus: The corpus for the current phase, as BoW lists or a document-by-term CSR matrix.
     - num_words: Total number of words in the corpus.
     - default_score: The default score to return in case of failure.
 
@@ -848,15 +890,15 @@ def calculate_perplexity_score(ldamodel, phase_corpus, default_score=0.25):
     - float: The calculated perplexity score or the default score.
     """
     # Calculate total number of words in the corpus
-    num_words = sum(cnt for doc in phase_corpus for _, cnt in doc)
-    if not phase_corpus or num_words == 0:
+    num_words = corpus_word_count(phase_corpus)
+    if corpus_size(phase_corpus) == 0 or num_words == 0:
         logging.warning("[calculate_perplexity_score] Empty or invalid phase_corpus. Returning default score.")
         return default_score
 
     with np.errstate(divide='ignore', invalid='ignore'):
         try:
-            logging.debug(f"[calculate_perplexity_score] Calculating perplexity. Phase corpus size: {len(phase_corpus)}, num_words: {num_words}")
-            negative_log_likelihood = ldamodel.log_perplexity(phase_corpus)
+            logging.debug(f"[calculate_perplexity_score] Calculating perplexity. Phase corpus size: {corpus_size(phase_corpus)}, num_words: {num_words}")
+            negative_log_likelihood = ldamodel.log_perplexity(as_gensim_corpus(phase_corpus))
 
             if not np.isfinite(negative_log_likelihood):
                 raise ValueError(f"Non-finite negative log-likelihood: {negative_log_likelihood}")
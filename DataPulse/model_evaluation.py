@@ -40,10 +40,9 @@ import pickle
 import math
 import hashlib
 import numpy as np
-import json
 
 from .alpha_eta import calculate_numeric_alpha, calculate_numeric_beta
-from .utils import convert_float32_to_float
+from .utils import serialize_to_jsonb
     
 # https://examples.dask.org/applications/embarrassingly-parallel.html
 def train_model(n_topics: int, alpha_str: list, beta_str: list, data: list, train_eval: str, 
@@ -52,7 +51,7 @@ def train_model(n_topics: int, alpha_str: list, beta_str: list, data: list, trai
         models_data = []
         coherehce_score_list = []
         corpus_batch = []
-        time_of_method_call = pd.to_datetime('now')
+        time_of_method_call = pd.Timestamp.now()
 
         try:
             # Compute several dask collections at once.
@@ -146,11 +145,8 @@ def train_model(n_topics: int, alpha_str: list, beta_str: list, data: list, trai
             for topic in show_topics_results
         ]
 
-        # Convert topics_to_store to ensure JSON compatibility
-        topics_to_store = convert_float32_to_float(topics_to_store)
-
-        # Convert to JSON format for PostgreSQL
-        show_topics_jsonb = json.dumps(topics_to_store)
+        # Convert to JSON format for PostgreSQL; orjson encodes the float32 probabilities natively
+        show_topics_jsonb = serialize_to_jsonb(topics_to_store)
 
         # Get top topics with their coherence scores
         topics = lda_model_gensim.top_topics(texts=batch_documents, processes=math.floor(cores*(1/3)))
@@ -174,7 +170,7 @@ def train_model(n_topics: int, alpha_str: list, beta_str: list, data: list, trai
 
         # add key for MD5 of json file(same as you did with text_md5)
         time_hash = hashlib.md5(time_of_method_call.strftime('%Y%m%d%H%M%S%f').encode()).hexdigest()
-        text_hash = hashlib.md5(pd.to_datetime('now').strftime('%Y%m%d%H%M%S%f').encode()).hexdigest()
+        text_hash = hashlib.md5(pd.Timestamp.now().strftime('%Y%m%d%H%M%S%f').encode()).hexdigest()
         string_time = text_hash.strip() + time_hash.strip()
         current_increment_data = {
                 'time_key': string_time,
@@ -209,7 +205,7 @@ def train_model(n_topics: int, alpha_str: list, beta_str: list, data: list, trai
                 'create_pylda': None, 
                 'create_pcoa': None, 
                 'time': time_of_method_call,
-                'end_time': pd.to_datetime('now'),
+                'end_time': pd.Timestamp.now(),
         }
 
         models_data.append(current_increment_data)
@@ -20,7 +20,7 @@
 
 import sys
 from .utils import exponential_backoff, garbage_collection
-from .write_to_postgres import add_model_data_to_database, create_dynamic_table_class, create_table_if_not_exists
+from .write_to_postgres import copy_model_data_to_database, create_dynamic_table_class, create_table_if_not_exists, prepare_model_data_row
 
 from time import sleep
 import logging
@@ -362,6 +362,9 @@ def process_completed_futures(phase, connection_string, corpus_label, \
     #    print(visualization_results[0], visualization_results[1])
     #print(f"this is the vis_results_map(): {vis_results_map}")
 
+    # Rows from all three phases are buffered and written with one batched COPY at the end
+    pending_rows = []
+
     # Process training futures
     if len(completed_train_futures) > 0:
         for models_data in completed_train_futures:
@@ -408,15 +411,10 @@ def process_completed_futures(phase, connection_string, corpus_label, \
             except Exception as e:
                     logging.error(f"Error occurred during process_completed_futures() TRAIN: {e}")
             try:
-                #print("We are prior to DynamicModelMetadata")
-                DynamicModelMetadata = create_dynamic_table_class(corpus_label)
-                #print("\nWe are prior to create_table_if_not_exist()")
-                create_table_if_not_exists(DynamicModelMetadata, connection_string)
-                #print("\nwe are prior to add_model_data_to_database()")
-                add_model_data_to_database(model_data, phase, corpus_label, connection_string,
-                                                num_documents, workers, batchsize, texts_zip_dir)
+                row, _ = prepare_model_data_row(model_data, phase, num_documents, workers, batchsize, texts_zip_dir)
+                pending_rows.append(row)
             except Exception as e:
-                logging.error(f"Error occurred during process_completed_futures() add_model_data_to_database() TRAIN: {e}")
+                logging.error(f"Error occurred during process_completed_futures() prepare_model_data_row() TRAIN: {e}")
 
     # Process evaluation futures
     #vis_futures = []
@@ -450,12 +448,10 @@ def process_completed_futures(phase, connection_string, corpus_label, \
             except Exception as e:
                 logging.error(f"Error occurred during process_completed_futures() EVAL: {e}")
             try:
-                DynamicModelMetadata = create_dynamic_table_class(corpus_label)
-                create_table_if_not_exists(DynamicModelMetadata, connection_string)
-                add_model_data_to_database(model_data,phase, corpus_label, connection_string,
-                                        num_documents, workers, batchsize, texts_zip_dir)
+                row, _ = prepare_model_data_row(model_data, phase, num_documents, workers, batchsize, texts_zip_dir)
+                pending_rows.append(row)
             except Exception as e:
-                logging.error(f"Error occurred during process_completed_futures() add_model_data_to_database() VALIDATION: {e}")
+                logging.error(f"Error occurred during process_completed_futures() prepare_model_data_row() VALIDATION: {e}")
 
     if len(completed_test_futures) > 0:    
         for models_data in completed_test_futures:
@@ -487,12 +483,18 @@ def process_completed_futures(phase, connection_string, corpus_label, \
             except Exception as e:
                 logging.error(f"Error occurred during process_completed_futures() EVAL: {e}")
             try:
-                DynamicModelMetadata = create_dynamic_table_class(corpus_label)
-                create_table_if_not_exists(DynamicModelMetadata, connection_string)
-                add_model_data_to_database(model_data, phase, corpus_label, connection_string,
-                                        num_documents, workers, batchsize, texts_zip_dir)
+                row, _ = prepare_model_data_row(model_data, phase, num_documents, workers, batchsize, texts_zip_dir)
+                pending_rows.append(row)
             except Exception as e:
-                logging.error(f"Error occurred during process_completed_futures() add_model_data_to_database() TEST: {e}")
+                logging.error(f"Error occurred during process_completed_futures() prepare_model_data_row() TEST: {e}")
+
+    if pending_rows:
+        try:
+            DynamicModelMetadata = create_dynamic_table_class(corpus_label)
+            create_table_if_not_exists(DynamicModelMetadata, connection_string)
+            copy_model_data_to_database(pending_rows, corpus_label, connection_string)
+        except Exception as e:
+            logging.error(f"Error occurred during process_completed_futures() copy_model_data_to_database(): {e}")
 
     return completed_train_futures, completed_validation_futures, completed_test_futures
 
@@ -611,6 +613,26 @@ def extract_topics_with_get_topic_terms(ldamodel, num_words, kwargs=None):
         ]
 
 
+
+def get_top_topic_words(ldamodel, topn=10):
+    """
+    Return the top `topn` words for every topic of an LDA model.
+
+    Matches calling show_topic(topic_id, topn) for each topic, but selects the top ids for all
+    topics with a single argpartition over the (num_topics, vocab_size) get_topics() matrix
+    instead of a full vocabulary argsort per topic.
+    """
+    topics = ldamodel.get_topics()
+    topn = max(1, min(topn, topics.shape[1]))
+
+    # Unordered top-n ids per topic, then sort only those n columns by probability
+    top_ids = np.argpartition(-topics, topn - 1, axis=1)[:, :topn]
+    rows = np.arange(topics.shape[0])[:, None]
+    order = np.argsort(-topics[rows, top_ids], axis=1)
+    top_ids = top_ids[rows, order]
+
+    return [[ldamodel.id2word[int(word_id)] for word_id in row] for row in top_ids]
+
     
 # Batch process to get topics for a batch of documents
 def get_document_topics_batch(ldamodel, bow_docs):
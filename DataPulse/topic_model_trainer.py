@@ -23,11 +23,11 @@
 import sys
 import pprint as pp
 import os
-import pandas as pd  # Used to handle timestamps and date formatting for logging and metadata.
 import dask
 from dask import delayed
 from dask.distributed import get_client
-from dask.distributed import wait  # Manages asynchronous execution in distributed settings, ensuring all futures are completed.
+from dask.distributed import as_completed  # Streams futures back in completion order so results are handled as they arrive.
+from dask.distributed import wait, secede, rejoin  # Blocks on the BoW shard tasks without holding a worker thread.
 import logging  # Provides error logging and information tracking throughout the script's execution.
 
 from gensim.models import LdaModel  # Implements Latent Dirichlet Allocation (LDA) for topic modeling.
@@ -36,23 +36,206 @@ from gensim.corpora import Dictionary  # Converts tokenized text data into a bag
 import pickle  # Serializes models and data structures to store results or share between processes.
 import math  # Supports mathematical calculations, such as computing fractional core usage for parallel processing.
 import hashlib  # Generates unique hashes for document metadata, ensuring data consistency.
+import struct  # Packs the random key material into raw bytes for hashing.
 import numpy as np  # Enables numerical operations, potentially for data manipulation or vector operations.
-import cupy as cp
-import json  # Provides JSON encoding and decoding, useful for handling data in a structured format.
+import orjson  # Fast JSON encoding with native NumPy scalar/ndarray support for the JSONB payloads.
 from typing import Union  # Allows type hinting for function parameters, improving code readability and debugging.
 import random
 from datetime import datetime
-from decimal import Decimal, InvalidOperation
 from time import time
-import copy
+from functools import lru_cache
+import scipy.sparse as sp  # Stacks the per-shard BoW count matrices.
+from sklearn.feature_extraction.text import CountVectorizer  # Batch BoW vectorization over pre-tokenized documents.
 
 from .alpha_eta import calculate_numeric_alpha, calculate_numeric_beta  # Functions that calculate alpha and beta values for LDA.
-from .utils import safe_serialize_for_postgres, convert_float32_to_float  # Utility functions for data type conversion, ensuring compatibility within the script.
-from .utils import NumpyEncoder
+from .utils import safe_serialize_for_postgres  # Utility functions for data type conversion, ensuring compatibility within the script.
+from .utils import flatten_documents, is_cupy_array, serialize_to_jsonb, zpack
 from .batch_estimation import estimate_batches_large_docs_v2
+from .write_to_postgres import MODEL_DATA_COLUMNS
 from .mathstats import *
 from .visualization import *
-from .process_futures import get_and_process_show_topics, get_document_topics_batch, extract_topics_with_get_topic_terms
+from .process_futures import get_and_process_show_topics, extract_topics_with_get_topic_terms, get_top_topic_words
+
+
+# Below this many documents per shard, task overhead outweighs distributing the BoW build
+MIN_DOCUMENTS_PER_BOW_SHARD = 500
+
+# Seconds to wait for the BoW shard tasks before building the matrix locally instead
+BOW_SHARD_TIMEOUT = 300
+
+# The upstream tokenizer only emits str tokens, so the per-token type checks can be skipped. Empty
+# tokens are still filtered either way. Set to False when feeding documents from an untrusted source.
+TRUST_TOKENIZER = True
+
+# Name the driver publishes the broadcast unified dictionary under, so train_model_v2 can reuse it
+UNIFIED_DICTIONARY_DATASET = 'unified_dictionary'
+
+# Tokens joined per hash update when digesting the batch text; bounds the temporary string size
+HASH_TOKENS_PER_UPDATE = 65536
+
+# Keys of the row train_model_v2 returns: the metadata table columns in COPY order, followed by the
+# blobs that are only archived to the ZIP file
+MODEL_RESULT_KEYS = MODEL_DATA_COLUMNS + ('lda_model', 'corpus', 'dictionary')
+
+# Initial value of the JSONB payloads; still being this exact object at the end means a payload was never filled in
+PLACEHOLDER_JSONB = serialize_to_jsonb([["not_initialized_yet"], ["no_real_data"]])
+
+
+def build_bow_matrix(documents, dictionary):
+    """
+    Vectorize pre-tokenized documents into a document-by-term CSR count matrix.
+
+    Parameters:
+    - documents (list of list of str): Tokenized documents.
+    - dictionary (Dictionary): Gensim dictionary whose token2id defines the vocabulary.
+
+    Returns:
+    - scipy.sparse.csr_matrix: Counts with one row per document and one column per token id.
+    """
+    vectorizer = CountVectorizer(
+        vocabulary=dictionary.token2id,
+        tokenizer=lambda x: x,
+        preprocessor=lambda x: x,
+        token_pattern=None,
+        lowercase=False,
+        dtype=np.int32
+    )
+    return vectorizer.fit_transform(documents)
+
+
+def build_bow_corpus(documents, dictionary, client=None, dictionary_future=None, num_shards=1):
+    """
+    Convert pre-tokenized documents to a Gensim BoW corpus in a single vectorized pass.
+
+    When a client is given and the batch is large enough, the documents are split into
+    contiguous shards that are vectorized on the workers and stacked back in order.
+
+    Parameters:
+    - documents (list of list of str): Tokenized documents.
+    - dictionary (Dictionary): Gensim dictionary whose token2id defines the vocabulary.
+    - client (Client, optional): Dask client used to vectorize shards in parallel.
+    - dictionary_future (Future, optional): Scattered copy of `dictionary` for the shard tasks.
+    - num_shards (int): Upper bound on the number of shards, typically the worker count.
+
+    Returns:
+    - tuple: (bow_corpus, X) where X is the document-by-term CSR count matrix and bow_corpus
+      is a Gensim Sparse2Corpus view over it that yields (token_id, count) lists per document,
+      sorted by token_id like doc2bow, without materializing them up front.
+    """
+    num_shards = min(num_shards, len(documents) // MIN_DOCUMENTS_PER_BOW_SHARD)
+
+    if client is None or num_shards <= 1:
+        X = build_bow_matrix(documents, dictionary)
+    else:
+        # Contiguous shards keep the row order of the stacked matrix identical to `documents`
+        bounds = np.linspace(0, len(documents), num_shards + 1, dtype=int)
+        shards = [documents[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+        futures = client.map(
+            build_bow_matrix, shards,
+            dictionary=dictionary_future if dictionary_future is not None else dictionary,
+            pure=False
+        )
+        X = None
+
+        # This runs inside a train_model_v2 task: leave the worker's thread pool while blocked so
+        # the shard tasks can be scheduled even when every thread is running a train_model_v2 call
+        try:
+            secede()
+            seceded = True
+        except ValueError:
+            seceded = False  # Called from the driver, not a worker thread
+        try:
+            wait(futures, timeout=BOW_SHARD_TIMEOUT)
+            X = sp.vstack(client.gather(futures), format='csr')
+        except TimeoutError:
+            logging.warning(f"BoW shards did not finish within {BOW_SHARD_TIMEOUT}s; building the matrix locally.")
+            client.cancel(futures)
+        finally:
+            if seceded:
+                rejoin()
+
+        if X is None:
+            X = build_bow_matrix(documents, dictionary)
+
+    # The CSR indptr/indices/data arrays are the only storage; documents are read from them on demand
+    return as_gensim_corpus(X), X
+
+
+# Defined at module level so the task takes the scattered model future instead of a bound method
+# that would pickle the whole model into the graph
+def model_top_topics(ldamodel, **kwargs):
+    """
+    Call LdaModel.top_topics on a (scattered) model; keyword arguments are passed through.
+    """
+    return ldamodel.top_topics(**kwargs)
+
+
+# Defined at module level so Dask pickles it by reference instead of capturing train_model_v2's scope
+def process_batch_get_document_topics(ldamodel, batch, minimum_probability=1e-8):
+    """
+    Topic distributions for a batch of BoW documents from a single LdaModel.inference call.
+
+    Matches get_document_topics(bow, minimum_probability=0) per document (Gensim clamps the
+    minimum to 1e-8), but runs the variational E-step over the whole batch at once.
+
+    Returns:
+    - list: One list of (topic_id, probability) tuples per document.
+    """
+    try:
+        # A lone (id, count) tuple is a one-word document
+        batch = [[bow_doc] if isinstance(bow_doc, tuple) else bow_doc for bow_doc in batch]
+        if not batch:
+            return []
+
+        gamma, _ = ldamodel.inference(batch, collect_sstats=False)
+        topic_dist = gamma / gamma.sum(axis=1, keepdims=True)
+
+        batch_results = []
+        for doc_dist in topic_dist:
+            topics = [(int(topic_id), float(doc_dist[topic_id])) for topic_id in np.flatnonzero(doc_dist >= minimum_probability)]
+            # Same placeholder get_document_topics_batch uses for empty results
+            batch_results.append(topics if topics else [{"topic_id": None, "probability": 0}])
+        return batch_results
+    except Exception as e:
+        logging.error(f"Error processing batch: {e}", exc_info=True)
+        raise
+
+
+# The same (base, phase, n_topics) triples recur across every batch of a run, so the joined paths are cached
+@lru_cache(maxsize=1024)
+def phase_topics_path(base_path, phase, n_topics):
+    """
+    Return the per-phase, per-topic-count output directory under base_path.
+    """
+    return os.path.join(base_path, phase, f"number_of_topics-{n_topics}")
+
+
+def encode_for_hash(text):
+    """
+    Encode text for hashing. str.isascii() reads a flag CPython keeps on the string, and ASCII text
+    encodes to the same bytes either way, so the common case skips the UTF-8 encoder's multibyte checks.
+    """
+    return text.encode('ascii') if text.isascii() else text.encode('utf-8', 'replace')
+
+
+def batch_text_hash(tokens):
+    """
+    Return a BLAKE2b state that has consumed the space-joined tokens of a batch.
+
+    The text is streamed into the digest in bounded slices instead of being joined whole.
+
+    Parameters:
+    - tokens (list of str): Flattened batch tokens.
+
+    Returns:
+    - hashlib.blake2b: The hash state; callers may update() it further.
+    """
+    text_hash = hashlib.blake2b(digest_size=32)
+    for start in range(0, len(tokens), HASH_TOKENS_PER_UPDATE):
+        if start:
+            text_hash.update(b' ')
+        text_hash.update(encode_for_hash(' '.join(tokens[start:start + HASH_TOKENS_PER_UPDATE])))
+    return text_hash
 
 
 # https://examples.dask.org/applications/embarrassingly-parallel.html
@@ -62,7 +245,7 @@ def train_model_v2(data_source: str, n_topics: int, alpha_str: Union[str,float],
                    per_word_topics: bool, ldamodel_parameter=None):
     client = get_client()
 
-    time_of_method_call = pd.to_datetime('now')  # Record the current timestamp for logging and metadata.
+    time_of_method_call = datetime.now()  # Record the current timestamp for logging and metadata.
 
     # Initialize a dictionary to hold the corpus data for each phase
     corpus_data = {
@@ -91,23 +274,22 @@ def train_model_v2(data_source: str, n_topics: int, alpha_str: Union[str,float],
                 batch_documents[idx] = [doc]  # Wrap single strings in a list to make them token lists
             
             elif isinstance(doc, list):
-                # Ensure all elements within the list are strings (tokens)
-                batch_documents[idx] = [str(token) for token in doc if token]  # Avoid empty tokens
+                # Only rebuild the token list when a C-level scan finds something to fix. Empty tokens are
+                # always checked for, since nothing upstream enforces their absence; a trusted tokenizer
+                # skips only the per-token type scan.
+                if '' in doc or (not TRUST_TOKENIZER and {type(token) for token in doc} != {str}):
+                    batch_documents[idx] = [str(token) for token in doc if token]  # Avoid empty tokens
 
             else:
                 # Raise an error if it's neither a string nor a list, and log details
                 logging.error(f"Unexpected type at index {idx}. Expected a list of tokens or string, got: {type(doc)}")
                 raise ValueError(f"Unexpected type at index {idx}. Expected list or string, got: {type(doc)}")
 
-        # Additional validation to check the final structure after processing
-        for idx, doc in enumerate(batch_documents):
-            if not isinstance(doc, list) or not all(isinstance(token, str) for token in doc):
-                logging.error(f"Document at index {idx} has an unexpected structure: {doc}")
-                raise ValueError(f"Document at index {idx} contains invalid structure.")
-
+        # The loop above already leaves every non-empty document as a list of str tokens,
+        # so no second validation pass over the tokens is needed.
 
-            # Optionally, convert batch_documents to a Gensim Dictionary if needed later
-            #train_dictionary = Dictionary(list(batch_documents))
+        # Optionally, convert batch_documents to a Gensim Dictionary if needed later
+        #train_dictionary = Dictionary(list(batch_documents))
 
     except Exception as e:
         logging.error(f"Error computing validation_test_data data: {e}")  # Log any errors during
@@ -148,40 +330,32 @@ def train_model_v2(data_source: str, n_topics: int, alpha_str: Union[str,float],
         logging.error("Dictionary is empty after filtering. Adjust thresholds.")
         return None
   
+    # Reuse the driver's broadcast of the dictionary for the BoW shards and metric tasks. Dask hands this
+    # task the resolved object, so the future is fetched from the published dataset; scatter only when none exists.
+    dictionary_future = client.get_dataset(UNIFIED_DICTIONARY_DATASET, default=None)
+    if dictionary_future is None:
+        dictionary_future = client.scatter(unified_dictionary, broadcast=True, hash=False)
+
    # Counters for success and failure
     number_of_documents = 0
     failed_convert_token_to_bow = 0
     corpus_to_pickle = ''
+    bow_matrix = None
 
     try:
-        for doc_tokens in batch_documents:
-            # Validate `doc_tokens`
-            if not isinstance(doc_tokens, list):
-                logging.warning(f"Unexpected structure for doc_tokens: {type(doc_tokens)}, content: {doc_tokens}")
-                try:
-                    doc_tokens = list(doc_tokens)  # Attempt conversion
-                except TypeError as e:
-                    logging.error(f"Failed to convert doc_tokens to list: {e}. Skipping.")
-                    failed_convert_token_to_bow += 1
-                    continue
-
-            # Skip empty documents
-            if not doc_tokens:
-                logging.warning("Skipping empty document.")
-                failed_convert_token_to_bow += 1
-                continue
-
-            try:
-                # Convert to BoW
-                bow_out = train_val_test_dictionary.doc2bow(doc_tokens)
-                
-                corpus_data[phase].append(bow_out)
-                number_of_documents+=1
-
-            except Exception as e:
-                logging.error(f"Error processing document: {doc_tokens}, error: {e}")
-                failed_convert_token_to_bow += 1
-                continue
+        # Skip empty documents; everything else was validated as a token list above
+        bow_documents = [doc_tokens for doc_tokens in batch_documents if doc_tokens]
+        failed_convert_token_to_bow = len(batch_documents) - len(bow_documents)
+        if failed_convert_token_to_bow:
+            logging.warning(f"Skipping {failed_convert_token_to_bow} empty documents.")
+
+        # Convert the whole batch to BoW in one vectorized pass, sharded across the workers for large batches
+        if bow_documents:
+            corpus_data[phase], bow_matrix = build_bow_corpus(
+                bow_documents, unified_dictionary,
+                client=client, dictionary_future=dictionary_future, num_shards=cores
+            )
+            number_of_documents = len(corpus_data[phase])
 
     except Exception as e:
         logging.error(f"Critical error in BoW processing: {e}")
@@ -190,7 +364,7 @@ def train_model_v2(data_source: str, n_topics: int, alpha_str: Union[str,float],
     chunksize = max(1, int(len(corpus_data[phase]) // 5))
 
     # Output the counts
-    #logging.info(f"Final BoW Counts: Successful {number_of_documents}, Failed {failed_convert_token_to_bow}")
+    logging.info(f"Final BoW Counts: Successful {number_of_documents}, Failed {failed_convert_token_to_bow}")
 
     #print(f"Final corpus_data[{phase}]: {corpus_data[phase][:100]}")  # Log a sample of corpus_data[phase]
 
@@ -209,7 +383,7 @@ def train_model_v2(data_source: str, n_topics: int, alpha_str: Union[str,float],
 
     if phase in ['validation', 'test']:
         # For validation and test phases, no model is created
-        ldamodel_bytes = pickle.dumps(ldamodel_parameter)
+        ldamodel_bytes = pickle.dumps(ldamodel_parameter, protocol=5)
         ldamodel = ldamodel_parameter
 
     elif phase == "train":
@@ -229,9 +403,6 @@ def train_model_v2(data_source: str, n_topics: int, alpha_str: Union[str,float],
                 chunksize=chunksize,
                 per_word_topics=True
             )
-            # Serialize the model as a delayed task
-            ldamodel_bytes = delayed(pickle.dumps)(ldamodel)
-
             #temp_dir = os.path.expanduser("~/temp/datapulse/")
             #os.makedirs(temp_dir, exist_ok=True)
             #ldamodel.save(f"{temp_dir}/model.model")
@@ -241,9 +412,20 @@ def train_model_v2(data_source: str, n_topics: int, alpha_str: Union[str,float],
     else:
         sys.exit()
 
+    # Reuse the CSR built alongside the BoW lists for every metric task instead of re-walking the tuples
+    phase_corpus = bow_matrix if bow_matrix is not None else corpus_data[phase]
+
+    # Scatter the model once; downstream tasks reference this future instead of re-pickling it.
+    # hash=False skips tokenizing (pickling) the whole model just to name the key.
+    ldamodel_future = client.scatter(ldamodel, broadcast=True, hash=False)
+
+    if phase == "train":
+        # Serialize the model as a delayed task on the scattered copy, as plain in-band protocol 5 bytes
+        ldamodel_bytes = delayed(pickle.dumps)(ldamodel_future, protocol=5)
+
     try:
         # Create the delayed task for the threshold without computing it immediately
-        threshold = dask.delayed(calculate_perplexity_threshold)(ldamodel, corpus_data[phase], DEFAULT_SCORE)
+        threshold = dask.delayed(calculate_perplexity_threshold)(ldamodel_future, phase_corpus, DEFAULT_SCORE)
     except Exception as e:
         logging.warning(f"Perplexity threshold calculation failed for phase {phase}. Using default score: {DEFAULT_SCORE}")
         # Create a delayed fallback task for the default score
@@ -260,7 +442,7 @@ def train_model_v2(data_source: str, n_topics: int, alpha_str: Union[str,float],
         try:
             # Create a delayed task for coherence score calculation without computing it immediately
             coherence_task = calculate_torch_coherence(
-                data_source, ldamodel, batch_documents, unified_dictionary
+                data_source, ldamodel_future, batch_documents, dictionary_future
             )
         except Exception as e:
             logging.warning("calculate_torch_coherence score calculation failed. Using default score.")
@@ -272,23 +454,18 @@ def train_model_v2(data_source: str, n_topics: int, alpha_str: Union[str,float],
             coherence_scores_data = dask.delayed(calculate_coherence_metrics)(
                 default_score=DEFAULT_SCORE,
                 real_coherence_value=coherence_task,
-                ldamodel=ldamodel,
-                dictionary=unified_dictionary,
+                ldamodel=ldamodel_future,
+                dictionary=dictionary_future,
                 texts=batch_documents,  # Correct parameter
                 cores = cores,
                 max_attempts=max_attempts
             )
 
-            # Extract metrics from processed data as delayed tasks
-            coherence_score = dask.delayed(lambda data: data['coherence_score'])(coherence_scores_data)
-            mean_coherence = dask.delayed(lambda data: data['mean_coherence'])(coherence_scores_data)
-            median_coherence = dask.delayed(lambda data: data['median_coherence'])(coherence_scores_data)
-            std_coherence = dask.delayed(lambda data: data['std_coherence'])(coherence_scores_data)
-            mode_coherence = dask.delayed(lambda data: data['mode_coherence'])(coherence_scores_data)
-
-            # Run compute here if everything is successful
-            coherence_score, mean_coherence, median_coherence, std_coherence, mode_coherence = dask.compute(
-                coherence_score, mean_coherence, median_coherence, std_coherence, mode_coherence
+            # Run compute here if everything is successful, then read the metrics straight from the dict
+            coherence_metrics = coherence_scores_data.compute()
+            coherence_score, mean_coherence, median_coherence, std_coherence, mode_coherence = (
+                coherence_metrics[key] for key in
+                ('coherence_score', 'mean_coherence', 'median_coherence', 'std_coherence', 'mode_coherence')
             )
         except Exception as e:
             logging.warning("Sample coherence scores calculation failed. NumPy default_rng().")
@@ -302,7 +479,7 @@ def train_model_v2(data_source: str, n_topics: int, alpha_str: Union[str,float],
         try:
             # Create a delayed task for convergence score calculation without computing it immediately
             convergence_task = dask.delayed(calculate_convergence)(
-                ldamodel, corpus_data[phase], DEFAULT_SCORE
+                ldamodel_future, phase_corpus, DEFAULT_SCORE
             )
         except Exception as e:
             logging.warning("Convergence calculation failed. Using default score.")
@@ -312,7 +489,7 @@ def train_model_v2(data_source: str, n_topics: int, alpha_str: Union[str,float],
         try:
             # Create a delayed task for perplexity score calculation without computing it immediately
             perplexity_task = dask.delayed(calculate_perplexity_score)(
-                ldamodel, corpus_data[phase], DEFAULT_SCORE
+                ldamodel_future, phase_corpus, DEFAULT_SCORE
             )
         except Exception as e:
             logging.warning("Perplexity score calculation failed. Using default score.")
@@ -321,13 +498,14 @@ def train_model_v2(data_source: str, n_topics: int, alpha_str: Union[str,float],
 
 
    # Initialize default JSONB values
-    topics_results_jsonb = json.dumps([["not_initialized_yet"], ["no_real_data"]])
-    topic_words_jsonb = json.dumps([["not_initialized_yet"], ["no_real_data"]])
-    validation_results_jsonb = json.dumps([["not_initialized_yet"], ["no_real_data"]])
+    topics_results_jsonb = PLACEHOLDER_JSONB
+    topic_words_jsonb = PLACEHOLDER_JSONB
+    validation_results_jsonb = PLACEHOLDER_JSONB
 
     # Calculate num_words
     try:
-        num_words = sum(sum(count for _, count in doc) for doc in corpus_data[phase])
+        # Reduce the CSR counts with the compiled kernel rather than walking every (id, count) tuple
+        num_words = int(sum_counts(bow_matrix.data)) if bow_matrix is not None else 0
         logging.debug(f"Calculated num_words for phase '{phase}': {num_words}")
     except Exception as e:
         logging.warning(f"Error calculating num_words: {e}")
@@ -338,11 +516,11 @@ def train_model_v2(data_source: str, n_topics: int, alpha_str: Union[str,float],
     extract_success = False
     try:
         logging.debug("Creating delayed task for topic extraction...")
-        topics_to_store_task = extract_topics_with_get_topic_terms(ldamodel, num_words=num_words)
+        topics_to_store_task = extract_topics_with_get_topic_terms(ldamodel_future, num_words=num_words)
         extract_success = True
     except Exception as e:
         logging.error("[extract_topics_with_get_topic_terms] failed to extract topics.")
-        topics_results_jsonb = json.dumps( [["failed_extract_topics_with_get_topic_terms"], ["not_initialized_yet"], ["no_real_data"]], cls=NumpyEncoder)
+        topics_results_jsonb = serialize_to_jsonb([["failed_extract_topics_with_get_topic_terms"], ["not_initialized_yet"], ["no_real_data"]])
         
     if extract_success == True:
         try:
@@ -351,48 +529,11 @@ def train_model_v2(data_source: str, n_topics: int, alpha_str: Union[str,float],
             logging.debug(f"Extracted topics: {topics_results_to_store}")
 
             # Update JSONB value
-            topics_results_jsonb = json.dumps(topics_results_to_store, cls=NumpyEncoder)
+            topics_results_jsonb = serialize_to_jsonb(topics_results_to_store)
         except Exception as e:
             logging.error(f"Error extracting topics: {e}")
-            topics_results_to_store = [["failed_extract_topics_with_get_topic_terms"], ["not_initialized_yet"], ["no_real_data"]]
+            topics_results_jsonb = serialize_to_jsonb([["failed_extract_topics_with_get_topic_terms"], ["not_initialized_yet"], ["no_real_data"]])
 
-            try:
-                topics_results_jsonb = convert_float32_to_float(topics_results_to_store)
-            except Exception as e:
-                logging.error(f"First attempt to serialize topics_results_to_store failed: {e}")
-                try:
-                    topics_results_jsonb = json.dumps(topics_results_to_store, cls=NumpyEncoder)
-                except Exception as e:
-                    logging.warning(f"Second topics_results_jsonb serialization attempt failed: {e}")
-                    try:
-                        # second attempt with specific handling for arrays/dataframes
-                        if isinstance(topics_results_to_store, np.ndarray):
-                            data = topics_results_to_store.astype(float).tolist()
-                            topics_results_jsonb = json.dumps(data)
-
-                        elif isinstance(topics_results_to_store, pd.DataFrame):
-                            data = topics_results_to_store.applymap(lambda x: float(x) if isinstance(x, (np.float32, np.float64)) else x)
-                            topics_results_jsonb = json.dumps(data)
-
-                        else:
-                            topics_results_jsonb = json.dumps(topics_results_to_store)
-
-                    except Exception as e:
-                        logging.error(f"All JSON topics_results_jsonb serialization attempts failed: {e}")
-                        topics_results_jsonb = json.dumps({"error": "Validation data generation failed", "phase": phase})
-        except Exception as e:
-            logging.error(f"Unexpected extract_topics_with_get_topic_terms error during topic processing: {e}")
-    
-
-
-    # Assuming the corpus_data[phase] is already split into batches
-    # Define a helper function to process each batch
-    def process_batch_get_document_topics(ldamodel, batch):
-        try:
-            return [get_document_topics_batch(ldamodel, bow_doc) for bow_doc in batch]
-        except Exception as e:
-            logging.error(f"Error processing batch: {e}", exc_info=True)
-            raise
 
     corpus_batches = []
     batch_size = -1
@@ -414,39 +555,50 @@ def train_model_v2(data_source: str, n_topics: int, alpha_str: Union[str,float],
             logging.warning("Utilizing entire corpus for document topic calculation.")
             corpus_batches = corpus_data[phase]
 
+        futures = []
         try:
-            # Submit each batch for processing directly
-            futures = []
-            for idx, batch in enumerate(corpus_batches):
-                start_time = time()
-                # Submit each batch for processing
-                logging.info(f"Submitting batch {idx + 1}: {batch[:5]}")  # Log a sample of the batch
-                future = client.submit(process_batch_get_document_topics, ldamodel, batch, pure=False, retries=6)
-                futures.append(future)
-                batch_id = idx + 1
-                total_batches = len(corpus_batches)
-                elapsed_time = time() - start_time
-                logging.info(f"[get_document_topics] Submitted batch {batch_id}/{total_batches} in {elapsed_time:.2f} seconds.")
+            start_time = time()
+            total_batches = len(corpus_batches)
+
+            # Submit all batches in a single graph submission
+            futures = client.map(
+                process_batch_get_document_topics, [ldamodel_future] * total_batches, corpus_batches,
+                pure=False, retries=6
+            )
+            elapsed_time = time() - start_time
+            logging.info(f"[get_document_topics] Submitted {total_batches} batches in {elapsed_time:.2f} seconds.")
         except Exception as e:
             logging.error(f"Error in topic_model_trainer/client.submit(process_batch_get_document_topics): {e}", exc_info=True)
             logging.error("SOURCE OF ERROR FOUND(0)")
             #sys.exit()
 
-        # Wait for completion and gather results
-        done_batches, not_done = wait(futures, timeout=300)
+        # Stream each batch's result into its slot as soon as it finishes and release the future,
+        # so the per-batch buffers on the workers are freed without waiting for the whole map
+        batch_results = [None] * len(futures)
+        batch_index = {future.key: idx for idx, future in enumerate(futures)}
+        collected_keys = set()
 
-        # Log errors in completed batches
-        for future in done_batches:
-            if future.status == 'error':
-                logging.error(f"Future failed with exception: {future.exception()}")
-                logging.error("SOURCE OF ERROR FOUND(1)")
+        def collect_batch_results(pending_futures):
+            try:
+                for future in as_completed(pending_futures, timeout=300):
+                    if future.status == 'error':
+                        logging.error(f"Future failed with exception: {future.exception()}")
+                        logging.error("SOURCE OF ERROR FOUND(1)")
+                    else:
+                        batch_results[batch_index[future.key]] = future.result(timeout=120)
+                    collected_keys.add(future.key)
+                    future.release()
+            except TimeoutError:
+                pass
+            return [future for future in pending_futures if future.key not in collected_keys]
+
+        not_done = collect_batch_results(futures)
 
         # Retry unresolved tasks
-        retry_done_batches, retry_not_done = [], []
         if not_done:
             logging.warning(f"Retrying {len(not_done)} unresolved tasks...")
-            retries = [client.retry(future) for future in not_done]
-            retry_done_batches, retry_not_done = wait(retries, timeout=300)
+            client.retry(not_done)
+            retry_not_done = collect_batch_results(not_done)
 
             # Log any unresolved tasks after retry
             if retry_not_done:
@@ -454,19 +606,10 @@ def train_model_v2(data_source: str, n_topics: int, alpha_str: Union[str,float],
                 for future in retry_not_done:
                     logging.error(f"Unresolved task after retry: {future.key}")
 
-        # Combine results from all completed batches
-        if not isinstance(done_batches, list):
-            done_batches = list(done_batches)
-        if not isinstance(retry_done_batches, list):
-            retry_done_batches = list(retry_done_batches)
-        all_done_batches = done_batches + retry_done_batches
-
-        try:
-            validation_results_to_store = [r.result(timeout=120) for r in all_done_batches]
-            total_documents = len(validation_results_to_store)
-            logging.info(f"[get_document_topics] Completed processing {total_documents} documents.")
-        except Exception as e:
-            logging.error(f"Error in topic_model_trainer/[r.result() for r in done_batches]: {e}")
+        # Keep submission order so batches line up with the corpus they were cut from
+        validation_results_to_store = [result for result in batch_results if result is not None]
+        total_documents = len(validation_results_to_store)
+        logging.info(f"[get_document_topics] Completed processing {total_documents} documents.")
 
 
         # Log the computed structure before further processing
@@ -478,134 +621,45 @@ def train_model_v2(data_source: str, n_topics: int, alpha_str: Union[str,float],
 
 
     try:
-        validation_results_jsonb = json.dumps(
-            validation_results_to_store,
-            default=lambda obj: (
-                float(obj) if isinstance(obj, (np.float32, np.float64, float, Decimal))
-                else int(obj) if isinstance(obj, (np.integer, int))
-                else list(obj) if isinstance(obj, np.ndarray)  # Convert arrays to lists
-                else str(obj)  # Fallback to string for anything else
-            )
-        )
+        validation_results_jsonb = serialize_to_jsonb(validation_results_to_store)
         #print("Serialized validation results (JSONB):", validation_results_jsonb)
-    except Exception as e:
-        logging.error(f"JSON serialization failed with TypeError: {e}")
-        try:
-            validation_results_jsonb = json.dumps(validation_results_to_store, cls=NumpyEncoder)
+    except orjson.JSONEncodeError as e:
+        logging.error(f"JSON serialization of validation results failed: {e}")
+        validation_results_jsonb = serialize_to_jsonb({"error": "Validation data generation failed", "phase": phase})
 
-        except Exception as e:
-            logging.warning(f"Second serialization attempt failed: {e}")
+    # Top words per topic for the top_topics column
+    try:
+        if phase == "train":
             try:
-                # Third attempt with specific handling for arrays/dataframes
-                if isinstance(validation_results_to_store, np.ndarray):
-                    data = validation_results_to_store.astype(float).tolist()
-                    validation_results_jsonb = json.dumps(data)
-
-                elif isinstance(validation_results_to_store, pd.DataFrame):
-                    data = validation_results_to_store.applymap(lambda x: float(x) if isinstance(x, (np.float32, np.float64)) else x)
-                    validation_results_jsonb = json.dumps(data)
-
-                else:
-                    validation_results_jsonb = json.dumps(validation_results_to_store)
-
-            except Exception as e:
-                logging.error("All JSON serialization attempts failed.")
-                validation_results_jsonb = json.dumps({"error": "Validation data generation failed", "phase": phase})
-
-    # Log any problematic types if serialization fails completely
-    if not validation_results_jsonb:
-        logging.error("Final serialization failed. Checking data types.")
-        for item in validation_results_to_store:
-            if isinstance(item, dict):
-                for key, value in item.items():
-                    logging.error(f"Type of {key}: {type(value)}")
-
-
-        # Validate batch_documents
-        if not batch_documents:
-            raise ValueError("Batch documents are empty!")
-        if not all(isinstance(doc, list) and all(isinstance(token, str) for token in doc) for doc in batch_documents):
-            print(f"ERROR IN BATCH STRUCTURE: {batch_documents}:")
-            raise ValueError("Batch documents have an incorrect structure!")
-
-        # Validate LDAModel
-        if not hasattr(ldamodel, 'num_topics') or ldamodel.num_topics <= 0:
-            raise ValueError("LDAModel is not properly trained. Ensure it has been trained with valid data.")
-        if not hasattr(ldamodel, 'state') or ldamodel.state is None:
-            raise ValueError("LDAModel state is missing. Training might not have been completed.")
-
-        # Test LDAModel functionality
-        try:
-            topic_words = ldamodel.show_topic(0, topn=5)  # Get top 5 words from topic 0
-            logging.debug(f"Top words for topic 0: {topic_words}")
-        except Exception as e:
-            logging.error(f"Error while retrieving topic words: {e}")
-            raise
-
-        
-        # Ensure that show_topic works without errors
-        try:
-            topic_words = ldamodel.show_topic(0, topn=5)  # Get top 5 words from topic 0
-            logging.debug(f"Top words for topic 0: {topic_words}")
-        except Exception as e:
-            logging.error(f"Error while retrieving topic words: {e}")
-            raise
-        try:
-            if phase == "train":
-                try:
-                    logging.debug("Phase: train - creating topic_words_task.")
-                    topic_words_task = dask.delayed(lambda: [
-                        [word for word, _ in ldamodel.show_topic(topic_id, topn=10)]
-                        for topic_id in range(ldamodel.num_topics)
-                    ])()
-                    logging.debug("topic_words_task created successfully.")
-                except Exception as e:
-                    logging.error(f"Error creating topic_words_task in train phase: {e}")
-                    topic_words_task = dask.delayed(lambda: [["N/A"]])()
-            else:
-                logging.debug("Phase: non-train - creating topics_task.")
-                topics_task = dask.delayed(ldamodel.top_topics)(
-                    texts=batch_documents,
-                    processes=math.floor(cores * (2 / 3))
-                )
-                logging.debug("topics_task created successfully.")
-
-                topic_words_task = dask.delayed(lambda topics: [[word for _, word in topic[0]] for topic in topics])(topics_task)
+                logging.debug("Phase: train - creating topic_words_task.")
+                topic_words_task = dask.delayed(get_top_topic_words)(ldamodel_future, topn=10)
                 logging.debug("topic_words_task created successfully.")
+            except Exception as e:
+                logging.error(f"Error creating topic_words_task in train phase: {e}")
+                topic_words_task = dask.delayed(lambda: [["N/A"]])()
+        else:
+            logging.debug("Phase: non-train - creating topics_task.")
+            topics_task = dask.delayed(model_top_topics)(
+                ldamodel_future,
+                texts=batch_documents,
+                processes=math.floor(cores * (2 / 3))
+            )
+            logging.debug("topics_task created successfully.")
 
-            logging.debug("Computing topic_words_task...")
-            topic_words = topic_words_task.compute()
-            logging.debug(f"topic_words computed successfully: {topic_words}")
-
-            topics_to_store = convert_float32_to_float(topic_words)
-            topic_words_jsonb = json.dumps(topics_to_store)  # Serialize to JSON format
-            logging.debug(f"Serialized topic words: {topic_words_jsonb}")
-
-        except Exception as e:
-            # Error during topic processing or serialization
-            logging.error(f"Critical failure in topic processing or serialization: {e}. Attempting second attempt with NumpyEncoder.")
-
-            try:
-                topic_words_jsonb = json.dumps(topics_to_store, cls=NumpyEncoder)
-
-            except TypeError as e:
-                logging.warning(f"Second topics_to_store serialization attempt failed: {e}")
-                try:
-                    # Third attempt with specific handling for arrays/dataframes
-                    if isinstance(topics_to_store, np.ndarray):
-                        data = topics_to_store.astype(float).tolist()
-                        topic_words_jsonb = json.dumps(data)
+            topic_words_task = dask.delayed(lambda topics: [[word for _, word in topic[0]] for topic in topics])(topics_task)
+            logging.debug("topic_words_task created successfully.")
 
-                    elif isinstance(topics_to_store, pd.DataFrame):
-                        data = topics_to_store.applymap(lambda x: float(x) if isinstance(x, (np.float32, np.float64)) else x)
-                        topic_words_jsonb = json.dumps(data)
+        logging.debug("Computing topic_words_task...")
+        topic_words = topic_words_task.compute()
+        logging.debug(f"topic_words computed successfully: {topic_words}")
 
-                    else:
-                        topic_words_jsonb = json.dumps(topics_to_store)
+        topic_words_jsonb = serialize_to_jsonb(topic_words)  # Serialize to JSON format
+        logging.debug(f"Serialized topic words: {topic_words_jsonb}")
 
-                except TypeError as e:
-                    logging.error("All JSON topics_to_store serialization attempts failed.")
-                    topic_words_jsonb = json.dumps({"error": "Validation data generation failed", "phase": phase})
+    except Exception as e:
+        # Error during topic processing or serialization
+        logging.error(f"Critical failure in topic processing or serialization: {e}")
+        topic_words_jsonb = serialize_to_jsonb({"error": "Validation data generation failed", "phase": phase})
 
 
     # Calculate batch size based on training data batch
@@ -615,123 +669,116 @@ def train_model_v2(data_source: str, n_topics: int, alpha_str: Union[str,float],
     random_value_1 = random.uniform(1.0, 1000.0)  # Continuous uniform distribution
     random_value_2 = random.randint(1, 100000)    # Discrete uniform distribution
 
-    # Convert the random values to strings and concatenate them
-    combined_random_value = f"{random_value_1}_{random_value_2}"
-
-    # Hash the combined random values to produce a unique identifier
-    random_hash = hashlib.md5(combined_random_value.encode()).hexdigest()
-
-    # Generate a timestamp-based hash for further uniqueness
-    time_of_method_call = datetime.now()
-    time_hash = hashlib.md5(time_of_method_call.strftime('%Y%m%d%H%M%S%f').encode()).hexdigest()
-
-    # Combine both hashes to produce a unique primary key
-    unique_primary_key = hashlib.md5((random_hash + time_hash).encode()).hexdigest()
+    # Hash the raw random values and the call timestamp in one digest to produce a unique primary key
+    key_hash = hashlib.blake2b(digest_size=16)
+    key_hash.update(struct.pack('<dq', random_value_1, random_value_2))
+    key_hash.update(time_of_method_call.strftime('%Y%m%d%H%M%S%f').encode('ascii'))
+    unique_primary_key = key_hash.hexdigest()
 
 
-    number_of_topics = f"number_of_topics-{n_topics}"
-    texts_zip = os.path.join(zip_path, phase, number_of_topics)
-    pca_image = os.path.join(pca_path, phase, number_of_topics)
-    pca_gpu_image = os.path.join(pca_gpu_path, phase, number_of_topics)
-    pyLDAvis_image = os.path.join(pylda_path, phase, number_of_topics)
+    texts_zip = phase_topics_path(zip_path, phase, n_topics)
+    pca_image = phase_topics_path(pca_path, phase, n_topics)
+    pca_gpu_image = phase_topics_path(pca_gpu_path, phase, n_topics)
+    pyLDAvis_image = phase_topics_path(pylda_path, phase, n_topics)
     
     # Group all main tasks that can be computed at once for efficiency
-    threshold, convergence_score, perplexity_score, topics_to_store = dask.compute(
-        threshold, convergence_task, perplexity_task, topics_to_store_task
+    # The train-phase model bytes ride along in the same call; the eager validation/test bytes pass straight through
+    threshold, convergence_score, perplexity_score, topics_to_store, ldamodel_bytes = dask.compute(
+        threshold, convergence_task, perplexity_task, topics_to_store_task, ldamodel_bytes
     )
 
 
-    if topic_words_jsonb == json.dumps([["not_initialized_yet"], ["no_real_data"]]):
+    if topic_words_jsonb is PLACEHOLDER_JSONB:
         logging.warning("topic_words_jsonb is still using the default placeholder!")
-    if topics_results_jsonb == json.dumps([["not_initialized_yet"], ["no_real_data"]]):
+    if topics_results_jsonb is PLACEHOLDER_JSONB:
         logging.warning("topics_results_jsonb is still using the default placeholder!") 
-    if validation_results_jsonb == json.dumps([["not_initialized_yet"], ["no_real_data"]]):
+    if validation_results_jsonb is PLACEHOLDER_JSONB:
         logging.warning("validation_results_jsonb is still using the default placeholder!")
 
     flattened_batch = []
     try:
         # Flatten and log structure
-        flattened_batch = [item for sublist in batch_documents for item in sublist]
+        flattened_batch = flatten_documents(batch_documents)
         logging.debug(f"Flattened batch structure: {flattened_batch[:10]}")  # Log a sample of the flattened batch
     except Exception as e:
         logging.error(f"Error while flattening batch_documents: {e}. Type: {type(batch_documents)}, Content: {batch_documents[:5]}")
         flattened_batch = [f"error: {str(e)}"]  
 
-    # Convert flattened_batch to a string for hashing
-    flattened_batch_str = ' '.join(flattened_batch)
-    flattened_batch_str =  flattened_batch_str + unique_primary_key
+    # Hash the space-joined batch text followed by the primary key; both text hash columns are cut from it.
+    text_hash = batch_text_hash(flattened_batch)
+    text_hash.update(unique_primary_key.encode('ascii'))
+    text_digest = text_hash.digest()
 
-    current_increment_data = {
+    # Values in MODEL_RESULT_KEYS order
+    current_increment_values = (
     # Metadata and Identifiers
-    'time_key': unique_primary_key,
-    'type': phase,
-    'start_time': time_of_method_call,
-    'end_time': pd.Timestamp.now(),  # More direct way to get current time
-    'num_workers': None,  # Use None instead of float('nan') for better compatibility
+    unique_primary_key,                     # time_key
+    phase,                                  # type
+    time_of_method_call,                    # start_time
+    datetime.now(),                         # end_time
+    None,                                   # num_workers; None instead of float('nan') for better compatibility
 
     # Document and Batch Details
-    'batch_size': batch_size,
-    'num_word': len(flattened_batch) if num_words != -1 else -1,
-    'text': pickle.dumps(flattened_batch),
-    'text_json': pickle.dumps(batch_documents),
-    'max_attempts': max_attempts, 
-    'top_topics': topic_words_jsonb,
-    'topics_words':topics_results_jsonb,
-    'validation_result': validation_results_jsonb,
-    'text_sha256': hashlib.sha256(flattened_batch_str.encode()).hexdigest(),
-    'text_md5': hashlib.md5(flattened_batch_str.encode()).hexdigest(),
-    'text_path': texts_zip,
-    'pca_path': pca_image,
-    'pca_gpu_path': pca_gpu_image,
-    'pylda_path': pyLDAvis_image,
+    batch_size,                             # batch_size
+    len(flattened_batch) if num_words != -1 else -1,  # num_word
+    zpack(batch_documents),                 # text_json
+    max_attempts,                           # max_attempts
+    topic_words_jsonb,                      # top_topics
+    topics_results_jsonb,                   # topics_words
+    validation_results_jsonb,               # validation_result
+    text_digest.hex(),                      # text_sha256
+    text_digest[:16].hex(),                 # text_md5
+    texts_zip,                              # text_path
+    pca_image,                              # pca_path
+    pca_gpu_image,                          # pca_gpu_path
+    pyLDAvis_image,                         # pylda_path
 
     # Model and Training Parameters
-    'topics': n_topics,
-    'alpha_str': str(alpha_str),  # Single string instead of a list
-    'n_alpha': n_alpha,
-    'beta_str': str(beta_str),  # Single string instead of a list
-    'n_beta': n_beta,
-    'passes': passes,
-    'iterations': iterations,
-    'update_every': update_every,
-    'eval_every': eval_every,
-    'chunksize': str(chunksize),  # Convert chunksize to string after use
-    'random_state': random_state,
-    'per_word_topics': per_word_topics,
+    n_topics,                               # topics
+    alpha_str if type(alpha_str) is str else str(alpha_str),  # alpha_str; single string instead of a list
+    n_alpha,                                # n_alpha
+    beta_str if type(beta_str) is str else str(beta_str),  # beta_str; single string instead of a list
+    n_beta,                                 # n_beta
+    passes,                                 # passes
+    iterations,                             # iterations
+    update_every,                           # update_every
+    eval_every,                             # eval_every
+    chunksize,                              # chunksize; already an int, matching the Integer column
+    random_state,                           # random_state
+    per_word_topics,                        # per_word_topics
 
     # Evaluation Metrics
-    'convergence': convergence_score,
-    'nll': negative_log_likelihood,
-    'perplexity': perplexity_score,
-    'coherence': coherence_score,
-    'mean_coherence': mean_coherence,
-    'median_coherence': median_coherence,
-    'mode_coherence': mode_coherence,
-    'std_coherence': std_coherence,
-    'perplexity_threshold': threshold,
-
-    # Serialized Data
-    'lda_model': ldamodel_bytes.compute(), # C:\Users\pqn7\OneDrive - CDC\git-projects\unified-topic-modeling-analysis\gpt\why-lda-is-delayed.md
-    'corpus': corpus_to_pickle,
-    'dictionary': pickle.dumps(train_val_test_dictionary),
+    convergence_score,                      # convergence
+    negative_log_likelihood,                # nll
+    perplexity_score,                       # perplexity
+    coherence_score,                        # coherence
+    mean_coherence,                         # mean_coherence
+    median_coherence,                       # median_coherence
+    mode_coherence,                         # mode_coherence
+    std_coherence,                          # std_coherence
+    threshold,                              # perplexity_threshold
 
     # Visualization Creation Verification Placeholders
-    'create_pylda': None,
-    'create_pcoa': None,
-    'create_pca_gpu': None
-    }
+    None,                                   # create_pylda
+    None,                                   # create_pcoa
+    None,                                   # create_pca_gpu
 
-    # Deep copy the dictionary for database-specific serialization
-    db_data = copy.deepcopy(current_increment_data)
-
-    db_data = {key: safe_serialize_for_postgres(value) for key, value in db_data.items()}
+    # Serialized Data
+    ldamodel_bytes,                         # lda_model; C:\Users\pqn7\OneDrive - CDC\git-projects\unified-topic-modeling-analysis\gpt\why-lda-is-delayed.md
+    corpus_to_pickle,                       # corpus
+    pickle.dumps(train_val_test_dictionary, protocol=pickle.HIGHEST_PROTOCOL),  # dictionary
+    )
 
-    # Debug serialized data types to ensure compatibility
-    for key, value in db_data.items():
-        #logging.debug(f"DB Key: {key}, Type: {type(value)}, Serialized Value: {value}")
-        if isinstance(value, np.ndarray):
-            logging.error(f"Key {key} is still ndarray after serialization!")
-        elif isinstance(value, cp.ndarray):
-            logging.error(f"Key {key} is still ndarray after serialization!")
+    # Build the database-specific row in one pass straight from the values; nothing else reads the raw ones
+    db_data = dict(zip(MODEL_RESULT_KEYS, map(safe_serialize_for_postgres, current_increment_values), strict=True))
+
+    # Debug serialized data types to ensure compatibility; skipped unless debug logging is on
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        for key, value in db_data.items():
+            #logging.debug(f"DB Key: {key}, Type: {type(value)}, Serialized Value: {value}")
+            if isinstance(value, np.ndarray):
+                logging.error(f"Key {key} is still ndarray after serialization!")
+            elif is_cupy_array(value):
+                logging.error(f"Key {key} is still ndarray after serialization!")
 
     return db_data
@@ -18,8 +18,14 @@
 # Developed with AI assistance to support SpectraSync’s high-efficiency analytical framework.
 
 import os
+import sys
 import logging
 import json
+import pickle
+import functools
+import itertools
+import orjson
+import zstandard
 from datetime import datetime
 import multiprocessing
 import gc
@@ -31,7 +37,6 @@ import time
 import shutil
 from decimal import Decimal
 import pandas as pd
-import cupy
 
 
 # Define a custom encoder class for NumPy types
@@ -50,16 +55,48 @@ class NumpyEncoder(json.JSONEncoder):
 
 
 
-def safe_serialize_for_postgres(value):
+def is_cupy_array(value):
     """
-    Convert values to PostgreSQL-compatible types.
+    Check for a CuPy array without importing CuPy. A CuPy array can only exist once the
+    module has been loaded, so CPU-only workers never pay for CUDA initialization here.
     """
-    if isinstance(value, (np.ndarray, cupy.ndarray)):  # Handle both NumPy and CuPy arrays
-        value = value.item() if value.size == 1 else value.tolist()
+    cupy = sys.modules.get('cupy')
+    return cupy is not None and isinstance(value, cupy.ndarray)
+
+def _as_is(value):
+    return value
+
+# Exact-type converters for the values a metadata row actually holds; anything else takes the isinstance path
+_POSTGRES_CONVERTERS = {
+    type(None): _as_is,
+    str: _as_is,
+    bytes: _as_is,
+    bool: _as_is,
+    int: _as_is,
+    float: _as_is,
+    Decimal: _as_is,
+    datetime: _as_is,
+    np.float64: float,
+    np.float32: float,
+    np.int64: int,
+    np.int32: int,
+}
+
+def _convert_for_postgres(value):
+    if isinstance(value, np.ndarray) or is_cupy_array(value):  # Handle both NumPy and CuPy arrays
+        return value.item() if value.size == 1 else value.tolist()
     elif isinstance(value, (np.float32, np.float64)):
-        value = float(value)
+        return float(value)
     elif isinstance(value, np.integer):
-        value = int(value)
+        return int(value)
+    return value
+
+def safe_serialize_for_postgres(value):
+    """
+    Convert values to PostgreSQL-compatible types.
+    """
+    converter = _POSTGRES_CONVERTERS.get(type(value))
+    value = converter(value) if converter is not None else _convert_for_postgres(value)
 
     # Scale large numeric values
     if isinstance(value, float) and abs(value) >= 10**5:
@@ -82,6 +119,68 @@ def convert_float32_to_float(data):
     else:
         return data
 
+# Frame magic that starts every zstd stream; pickles start with b'\x80' so the two can't be confused
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+def zpack(obj):
+    """
+    Pickle an object with the highest protocol and zstd-compress it for bytea storage.
+    """
+    # ZstdCompressor instances are not safe to share between threads, and Dask runs several tasks per
+    # process as threads, so a compressor is created per call instead of kept at module level
+    return zstandard.ZstdCompressor(level=3).compress(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+def zpack_to_pickle(blob):
+    """
+    Return the plain pickle bytes inside a zpack blob, e.g. for writing into an archive.
+    """
+    if bytes(blob[:4]) == ZSTD_MAGIC:
+        return zstandard.ZstdDecompressor().decompress(blob)
+    return blob
+
+def zunpack(blob):
+    """
+    Restore an object produced by zpack. Uncompressed pickle bytes from older rows are also accepted.
+    """
+    return pickle.loads(zpack_to_pickle(blob))
+
+def flatten_documents(documents):
+    """
+    Flatten a list of tokenized documents into one token list, e.g. to rebuild the flat text of a
+    row from its pickled text_json.
+    """
+    return list(itertools.chain.from_iterable(documents))
+
+# Conversions for the values orjson can't encode natively; orjson only calls this for those types
+@functools.singledispatch
+def to_jsonable(obj):
+    return str(obj)  # Fallback to string for anything else
+
+@to_jsonable.register(np.ndarray)
+def _(obj):
+    return obj.tolist()  # Non-native dtypes or non-contiguous arrays
+
+@to_jsonable.register(np.generic)
+def _(obj):
+    return obj.item()
+
+@to_jsonable.register(Decimal)
+def _(obj):
+    return float(obj)
+
+@to_jsonable.register(pd.DataFrame)
+def _(obj):
+    # to_dict boxes numeric columns to Python scalars per column dtype (and NumPy scalars in object
+    # columns to native ones), so no per-cell or per-column float conversion is needed first
+    return obj.to_dict(orient='records')
+
+def serialize_to_jsonb(obj):
+    """
+    Serialize a value to a JSON string for a JSONB column in a single orjson pass.
+    NumPy scalars and arrays are encoded natively; other types go through to_jsonable.
+    """
+    return orjson.dumps(obj, default=to_jsonable, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+
 def json_fallback_handler(obj):
     if isinstance(obj, (np.float32, np.float64, float)):
         return float(obj)
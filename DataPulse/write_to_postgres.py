@@ -15,12 +15,14 @@
 #
 # Dependencies:
 # - Python libraries: os, json, random, hashlib, zipfile, logging, numpy, pandas
-# - Database libraries: sqlalchemy, dask.dataframe
+# - Database libraries: sqlalchemy, psycopg2 (COPY), dask.dataframe
 #
 # Developed with AI assistance to power SpectraSync’s scalable and adaptive data architecture.
 
 
 import os
+import io
+from datetime import datetime
 from json import load
 from random import shuffle
 import pandas as pd 
@@ -31,13 +33,13 @@ import dask.dataframe as dd
 import numpy as np
 import sqlalchemy
 from sqlalchemy import create_engine, inspect
+from sqlalchemy import text as sql_text
 from sqlalchemy.exc import ProgrammingError
-from sqlalchemy.orm import sessionmaker
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, LargeBinary, TEXT, JSON, Float, Numeric
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 import pickle
-from .utils import garbage_collection
+from .utils import flatten_documents, garbage_collection, zpack_to_pickle
 
 Base = declarative_base()
 
@@ -100,8 +102,8 @@ def create_dynamic_table_class(table_name):
     # Document and Batch Details
     'batch_size' : Column(Integer, nullable=False),
     'num_word' : Column(Integer, nullable=False),
-    'text' : Column(LargeBinary, nullable=False),
-    'text_json' : Column(LargeBinary, nullable=False),
+    'text' : Column(LargeBinary, nullable=True),  # No longer written; derive from text_json
+    'text_json' : Column(LargeBinary, nullable=False),  # zstd-compressed pickle, see utils.zpack
     'max_attempts': Column(Integer, nullable=False),
     'top_topics': Column(JSONB, nullable=False),
     'topics_words': Column(JSONB, nullable=False),
@@ -177,23 +179,79 @@ def create_table_if_not_exists(table_class, database_uri):
             logging.error(f"An error occurred while creating the table: {e}")
             raise  # Re-raise exception after logging it for further handling or clean exit.
     else:
-        logging.info(f"Table '{table_class.__tablename__}' already exists. No action taken.")
+        # Tables from earlier runs still declare 'text' NOT NULL, but rows no longer write that column
+        text_column = next((column for column in inspector.get_columns(table_class.__tablename__)
+                            if column['name'] == 'text'), None)
+        if text_column is not None and not text_column['nullable']:
+            quoted_table = engine.dialect.identifier_preparer.quote(table_class.__tablename__)
+            with engine.begin() as connection:
+                connection.execute(sql_text(f"ALTER TABLE {quoted_table} ALTER COLUMN text DROP NOT NULL"))
+            logging.info(f"Table '{table_class.__tablename__}' already exists. Dropped NOT NULL from column 'text'.")
+        else:
+            logging.info(f"Table '{table_class.__tablename__}' already exists. No action taken.")
 
 
-# Function to add new model data to metadata postgres table
-def add_model_data_to_database(model_data, phase, table_name, database_uri, 
-                               num_documents, workers, batchsize, texts_zip_dir):
+# Rows buffered per COPY statement when flushing model data to the metadata table
+COPY_BATCH_SIZE = 1000
+
+# Columns written by COPY, in the order prepare_model_data_row lays out each row tuple.
+# 'text' is no longer written and is left NULL.
+MODEL_DATA_COLUMNS = (
+    # Metadata and Identifiers
+    'time_key', 'type', 'start_time', 'end_time', 'num_workers',
+
+    # Document and Batch Details
+    'batch_size', 'num_word', 'text_json', 'max_attempts', 'top_topics', 'topics_words',
+    'validation_result', 'text_sha256', 'text_md5', 'text_path', 'pca_path', 'pca_gpu_path', 'pylda_path',
+
+    # Model and Training Parameters
+    'topics', 'alpha_str', 'n_alpha', 'beta_str', 'n_beta', 'passes', 'iterations', 'update_every',
+    'eval_every', 'chunksize', 'random_state', 'per_word_topics',
+
+    # Evaluation Metrics
+    'convergence', 'nll', 'perplexity', 'coherence', 'mean_coherence', 'median_coherence',
+    'mode_coherence', 'std_coherence', 'perplexity_threshold',
+
+    # Visualization Placeholders
+    'create_pylda', 'create_pcoa', 'create_pca_gpu',
+)
+
+# Characters that must be backslash-escaped in a COPY ... (FORMAT text) stream
+_COPY_TEXT_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _copy_text_value(value):
     """
-    Add new model data to the specified table in the database.
+    Render one value as a field of a PostgreSQL COPY text-format stream.
+    """
+    if value is None:
+        return '\\N'
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return '\\\\x' + bytes(value).hex()  # bytea hex format; the backslash itself is escaped for COPY
+    if isinstance(value, (bool, np.bool_)):
+        return 't' if value else 'f'
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value).translate(_COPY_TEXT_ESCAPES)
+
+
+# Function to prepare model data for the metadata postgres table
+def prepare_model_data_row(model_data, phase, num_documents, workers, batchsize, texts_zip_dir):
+    """
+    Archive the text and model blobs of a model_data record and return the row for the metadata table.
     
     Args:
         model_data (dict): The dictionary containing model data.
-        table_class (class): The SQLAlchemy model class for the target table.
-        database_uri (str): The database connection string.
+        phase (str): The phase the record belongs to; used for the archive directory.
+        texts_zip_dir (str): Root directory for the ZIP archives.
+        
+    Returns:
+        tuple: (row, zip_path) where row is a tuple of the stored values in MODEL_DATA_COLUMNS order.
     """
 
     # Save large body of text to zip and update model_data reference
     texts_zipped = []
+    zip_path = None
 
     # Path to the distinct document folder to contain all related documents
     #print("Attempting to create document directory...")
@@ -210,63 +268,131 @@ def add_model_data_to_database(model_data, phase, table_name, database_uri,
 
     try:
         logging.info(f"model_data['text_md5'] contents: {model_data.get('text_md5')}")
-        text = [pickle.loads(model_data['text'])]
+        # The flat text is not stored separately; rebuild it from the per-document token lists
+        text_json_pickle = zpack_to_pickle(model_data['text_json'])
+        text = [flatten_documents(pickle.loads(text_json_pickle))]
         for text_list in text:
             combined_text = ' '.join([''.join(sent) for sent in text_list])  # Combine all sentences into one string
 
             #logging.info("Calling save_to_zip...")
             zip_path = save_to_zip(model_data['time_key'], document_dir, pickle.dumps(combined_text), \
-                                model_data['text_json'], model_data['lda_model'], \
+                                text_json_pickle, model_data['lda_model'], \
                                 model_data['corpus'], model_data['dictionary'], texts_zip_dir)
             
             texts_zipped.append(zip_path)
     except Exception as e:
         logging.error(f"Error during zipping process: {e}")
 
+    # Update model_data with additional information if necessary
+    model_data['batch_size'] = batchsize
+    model_data['num_workers'] = workers
+    model_data['num_documents'] = num_documents
+    row = tuple(model_data.get(column) for column in MODEL_DATA_COLUMNS)
+
+    return row, zip_path
+
+
+def _insert_value(value):
+    """
+    Adapt a row value for a parameterized INSERT; psycopg2 has no adapter for NumPy booleans.
+    """
+    return bool(value) if isinstance(value, np.bool_) else value
+
+
+def copy_model_data_to_database(rows, table_name, database_uri):
+    """
+    Write prepared model data rows to the specified table with PostgreSQL COPY, COPY_BATCH_SIZE rows per statement.
+
+    Each chunk is copied inside its own SAVEPOINT. COPY is all-or-nothing, so when a chunk fails
+    (e.g. a NULL visualization flag or a duplicate time_key) its rows are re-inserted one at a time
+    and only the offending rows are dropped and logged.
+    
+    Args:
+        rows (list of tuple): Rows returned by prepare_model_data_row.
+        table_name (str): The name of the target table.
+        database_uri (str): The database connection string.
+    """
+    if not rows:
+        return
+
     # Create an engine using the provided DATABASE_URI
     engine = create_engine(database_uri, echo=False)  # Optional: `echo=True` for detailed SQL logging
-    logging.info("Database engine created successfully.")
+    preparer = engine.dialect.identifier_preparer
+    quoted_table = preparer.quote(table_name)
+    quoted_columns = ', '.join(preparer.quote(column) for column in MODEL_DATA_COLUMNS)
+    copy_sql = f"COPY {quoted_table} ({quoted_columns}) FROM STDIN WITH (FORMAT text)"
+    insert_sql = (
+        f"INSERT INTO {quoted_table} ({quoted_columns}) "
+        f"VALUES ({', '.join(['%s'] * len(MODEL_DATA_COLUMNS))})"
+    )
+    time_key_index = MODEL_DATA_COLUMNS.index('time_key')
 
-    # Create a session factory bound to this engine
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    logging.info("Database session created successfully.")
-    
+    # COPY goes through the psycopg2 connection underneath SQLAlchemy
+    connection = engine.raw_connection()
+    logging.info("Database connection created successfully.")
+    written, lost_time_keys = 0, []
     try:
-        # Use the provided function to get the dynamic table class for table_name
-        DynamicModel = create_dynamic_table_class(table_name)
-
-        # Update model_data with additional information if necessary
-        model_data['batch_size'] = batchsize
-        model_data['num_workers'] = workers
-        model_data['num_documents'] = num_documents
-        new_model_data = {key: val for key, val in model_data.items() if key not in ['num_documents','lda_model', 'corpus', 'dictionary']}
-        
-        # Log type information before insertion
-        #logging.info(f"Type of 'create_pylda' before insertion: {type(new_model_data['create_pylda'])}")
-        #logging.info(f"Type of 'create_pylda' before insertion: {new_model_data['create_pylda']}")
-        #logging.info(f"Type of 'create_pcoa' before insertion: {type(new_model_data['create_pcoa'])}")
-        #logging.info(f"Type of 'create_pcoa' before insertion: {new_model_data['create_pcoa']}")
-
-        # Create an instance of the dynamic table class with model_data
-        record = DynamicModel(**new_model_data)
-        
-        # Add the new record to the session and commit it to the database
-        session.add(record)
-        logging.info("Data added to session successfully.")
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), COPY_BATCH_SIZE):
+                chunk = rows[start:start + COPY_BATCH_SIZE]
+                buffer = io.StringIO()
+                for row in chunk:
+                    buffer.write('\t'.join(map(_copy_text_value, row)))
+                    buffer.write('\n')
+                buffer.seek(0)
+
+                cursor.execute("SAVEPOINT copy_chunk")
+                try:
+                    cursor.copy_expert(copy_sql, buffer)
+                    cursor.execute("RELEASE SAVEPOINT copy_chunk")
+                    written += len(chunk)
+                    continue
+                except Exception as e:
+                    logging.warning(f"COPY of {len(chunk)} rows failed, inserting them one at a time: {e}")
+                    cursor.execute("ROLLBACK TO SAVEPOINT copy_chunk")
+
+                # Fall back to row-by-row inserts so a single bad row does not take the chunk with it
+                for row in chunk:
+                    cursor.execute("SAVEPOINT insert_row")
+                    try:
+                        cursor.execute(insert_sql, [_insert_value(value) for value in row])
+                        cursor.execute("RELEASE SAVEPOINT insert_row")
+                        written += 1
+                    except Exception as e:
+                        cursor.execute("ROLLBACK TO SAVEPOINT insert_row")
+                        lost_time_keys.append(row[time_key_index])
+                        logging.error(f"Dropped row with time_key {row[time_key_index]}: {e}")
+
+        # Commit the transaction to save changes
+        connection.commit()
+        logging.info(f"{written} rows committed successfully to the database.")
+        if lost_time_keys:
+            logging.error(f"{len(lost_time_keys)} rows were not written; time_key values: {lost_time_keys}")
 
-        # Commit the session to save changes
-        session.commit()
-        logging.info("Data committed successfully to the database.")
-        
     except Exception as e:
         # Log or print error message here (depending on your logging setup)
         logging.error(f"An error occurred while adding data: {e}")
-        # If there was any exception during insertion, rollback the transaction
-        session.rollback()
+        # If there was any exception outside the savepoints, rollback the transaction
+        connection.rollback()
     finally:
-        # Close the session whether or not an exception occurred
-        session.close()
-        logging.info("Database session closed.")
+        # Close the connection whether or not an exception occurred
+        connection.close()
+        engine.dispose()
+        logging.info("Database connection closed.")
+
+
+# Function to add new model data to metadata postgres table
+def add_model_data_to_database(model_data, phase, table_name, database_uri, 
+                               num_documents, workers, batchsize, texts_zip_dir):
+    """
+    Add new model data to the specified table in the database.
+    
+    Args:
+        model_data (dict): The dictionary containing model data.
+        table_class (class): The SQLAlchemy model class for the target table.
+        database_uri (str): The database connection string.
+    """
+    row, zip_path = prepare_model_data_row(model_data, phase, num_documents, workers, batchsize, texts_zip_dir)
+    copy_model_data_to_database([row], table_name, database_uri)
 
-        return zip_path
\ No newline at end of file
+    return zip_path
@@ -471,8 +471,11 @@ if __name__=="__main__":
     #for batch_info in futures_create_lda_datasets(DATA_SOURCE, TRAIN_RATIO, VALIDATION_RATIO, FUTURES_BATCH_SIZE):
     for batch_info in futures_create_lda_datasets_v3(DATA_SOURCE):
         if batch_info['type'] == "dictionary":
-            # Retrieve the dictionary
+            # Retrieve the dictionary and place one copy on every worker so tasks
+            # reference it in worker memory instead of unpickling it per submit
             unified_dictionary = batch_info['data']
+            unified_dictionary_future = client.scatter(unified_dictionary, broadcast=True)
+            client.publish_dataset(override=True, **{UNIFIED_DICTIONARY_DATASET: unified_dictionary_future})
 
         elif batch_info['type'] == "train":
             # Handle training data
@@ -658,7 +661,7 @@ if __name__=="__main__":
                     try:
                         # Submit future for training
                         future = client.submit(
-                            train_model_v2, DATA_SOURCE, n_topics, alpha_value, beta_value, TEXTS_ZIP_DIR, PYLDA_DIR, PCOA_DIR, PCA_GPU_DIR, unified_dictionary, scattered_data, "train",
+                            train_model_v2, DATA_SOURCE, n_topics, alpha_value, beta_value, TEXTS_ZIP_DIR, PYLDA_DIR, PCOA_DIR, PCA_GPU_DIR, unified_dictionary_future, scattered_data, "train",
                             RANDOM_STATE, PASSES, ITERATIONS, UPDATE_EVERY, EVAL_EVERY, num_workers, PER_WORD_TOPICS, ldamodel_parameter=None, pure=False, retries=3
                         )
                         future_map[model_key] = future  # Track the future
@@ -754,7 +757,7 @@ if __name__=="__main__":
                 model_key = (n_topics, alpha_value, beta_value)
                 ldamodel = pickle.loads(train_models_dict[model_key])
                 future = client.submit(
-                    train_model_v2, DATA_SOURCE, n_topics, alpha_value, beta_value, TEXTS_ZIP_DIR, PYLDA_DIR, PCOA_DIR, PCA_GPU_DIR, unified_dictionary, scattered_data, "validation",
+                    train_model_v2, DATA_SOURCE, n_topics, alpha_value, beta_value, TEXTS_ZIP_DIR, PYLDA_DIR, PCOA_DIR, PCA_GPU_DIR, unified_dictionary_future, scattered_data, "validation",
                     RANDOM_STATE, PASSES, ITERATIONS, UPDATE_EVERY, EVAL_EVERY, num_workers, PER_WORD_TOPICS, ldamodel=ldamodel, pure=False, retries=3
                 )
                 validation_futures.append(future)
@@ -840,7 +843,7 @@ if __name__=="__main__":
                 model_key = (n_topics, alpha_value, beta_value)
                 ldamodel = pickle.loads(test_models_dict[model_key])
                 future = client.submit(
-                    train_model_v2, DATA_SOURCE, n_topics, alpha_value, beta_value, TEXTS_ZIP_DIR, PYLDA_DIR, PCOA_DIR, PCA_GPU_DIR, unified_dictionary, scattered_data, "test",
+                    train_model_v2, DATA_SOURCE, n_topics, alpha_value, beta_value, TEXTS_ZIP_DIR, PYLDA_DIR, PCOA_DIR, PCA_GPU_DIR, unified_dictionary_future, scattered_data, "test",
                     RANDOM_STATE, PASSES, ITERATIONS, UPDATE_EVERY, EVAL_EVERY, num_workers, PER_WORD_TOPICS, ldamodel=ldamodel, pure=False, retries=3
                 )
                 test_futures.append(future)